@@ -1,96 +1,434 @@
 import os
+import sys
 import json
-import textwrap
-from typing import Dict, List, Any, Optional
+import re
+import atexit
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, List, Any, Optional, Set, Tuple
 
 from unit_converter import UnitConverter
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON from raw bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize an object to UTF-8 JSON bytes, compact unless indent is set, using orjson when available."""
+    if orjson is not None:
+        option = orjson.OPT_APPEND_NEWLINE
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        text = json.dumps(obj, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+    return (text + "\n").encode("utf-8")
+
+
+# Number of unsaved changes after which recipes are written to disk
+AUTOSAVE_MUTATIONS = 50
+
+# Buffer size used when writing data files
+WRITE_BUFFER_SIZE = 256 * 1024
+
+
+def _write_file_atomic(path: str, payload: bytes, sync: bool = False) -> None:
+    """Replace a file's contents so readers never see a partly written file."""
+    # Write to a temporary file next to the target and swap it in, so a
+    # failed write never leaves a truncated file behind
+    tmp_file = f"{path}.tmp"
+    with open(tmp_file, 'wb', buffering=WRITE_BUFFER_SIZE) as file:
+        file.write(payload)
+        if sync:
+            file.flush()
+            os.fsync(file.fileno())
+    os.replace(tmp_file, path)
+
+
+def _yes(prompt: str) -> bool:
+    """Ask a y/n question and return whether the answer starts with 'y'."""
+    return input(prompt).strip()[:1] in ('y', 'Y')
+
+
+# Shared wrapper for recipe instructions and notes, created on first use
+_WRAPPER = None
+
+
+@lru_cache(maxsize=512)
+def _wrap(text: str) -> Tuple[str, ...]:
+    """Wrap recipe text to 70 columns, caching the result per distinct text."""
+    global _WRAPPER
+    if _WRAPPER is None:
+        import textwrap
+        _WRAPPER = textwrap.TextWrapper(width=70)
+    return tuple(_WRAPPER.wrap(text))
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Ingredient line with an amount and optional unit, e.g. "Olive Oil 2 tbsp" or "Eggs 2"
+_INGREDIENT_RE = re.compile(r"^(?P<name>.+?)\s+(?P<amount>\d+(?:\.\d*)?|\.\d+)\s*(?P<unit>\S+)?$")
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split already-lowercased text into word tokens for the search index."""
+    return _TOKEN_RE.findall(text)
+
+
 class RecipeManager:
     def __init__(self, data_file: str = "recipes.json", price_file: str = "ingredients.json"):
         self.data_file = data_file
         self.price_file = price_file
+        # Interned lowercase form of every name lowercased so far
+        self._lowercase_names: Dict[str, str] = {}
         self.recipes = self.load_recipes()
         self.price_data = self.load_price_data()
+        # Price per recipe unit for each (ingredient key, unit) pair, or None
+        # when it can't be priced. Cleared whenever price data changes.
+        self._factor_cache: Dict[Tuple[str, str], Optional[float]] = {}
+        self._price_version = 0
+        # Recipe prices keyed by id() of the recipe dict, stored with the
+        # price version they were computed under
+        self._recipe_price_cache: Dict[int, Tuple[int, Optional[float]]] = {}
+        # Sorted (folder names, recipe names) per folder, keyed by id() of the
+        # folder dict. Kept outside the tree so it is never saved.
+        self._sort_cache: Dict[int, Tuple[List[str], List[str]]] = {}
         self.current_path = []
+        # Nodes along current_path, starting at the root, so the current
+        # folder never has to be looked up from the root again
+        self._node_stack = [self.recipes]
+        self.current_node = self.recipes
+        # Display form of current_path, rebuilt only when the path changes
+        self._path_str = "/"
+        # Search index mapping word tokens to (folder path, recipe name) entries
+        self._index: Dict[str, Set[Tuple[Tuple[str, ...], str]]] = {}
+        # Recipe dict plus lowercased recipe name and ingredient names for each
+        # indexed recipe, kept in memory only so searches never re-lowercase
+        # the same strings or walk the tree to reach a matched recipe
+        self._indexed_recipes: Dict[Tuple[Tuple[str, ...], str], Tuple[Dict, str, Tuple[str, ...]]] = {}
+        self._rebuild_index()
+        self._recipes_dirty = False
+        self._prices_dirty = False
+        self._mutation_count = 0
+        self._completions: List[str] = []
+        # Command name -> (handler, usage). Handlers with a usage string take
+        # the command argument, and the usage is shown when it is missing.
+        self._commands: Dict[str, Tuple[Callable, Optional[str]]] = {
+            "help": (self.print_help, None),
+            "save": (self._cmd_save, None),
+            "ls": (self.list_content, None),
+            "cd": (self._cmd_cd, "cd <folder> or cd .."),
+            "mkdir": (self.create_folder, "mkdir <folder>"),
+            "rmdir": (self.delete_folder, "rmdir <folder>"),
+            "view": (self.view_recipe, "view <recipe>"),
+            "create": (self.create_recipe, "create <recipe>"),
+            "edit": (self.edit_recipe, "edit <recipe>"),
+            "delete": (self.delete_recipe, "delete <recipe>"),
+            "move": (self._cmd_move, "move <recipe> <destination_path>"),
+            "search": (self.search_recipes, "search <query>"),
+            "price": (self._cmd_price, "price <ingredient> <price> <unit>\nExample: price Onion 1 oz"),
+        }
+        # Recipe snapshots are written to disk by a background thread so
+        # saving never blocks the prompt
+        self._pending_payload: Optional[bytes] = None
+        # Whether the queued snapshot should be synced to disk once written
+        self._pending_sync = False
+        self._writer_lock = threading.Lock()
+        self._writer_event = threading.Event()
+        # Outcome messages of background writes, printed by the main thread
+        # so they never land in the middle of the prompt
+        self._write_reports: List[str] = []
+        # Set whenever no snapshot is queued or being written
+        self._writer_idle = threading.Event()
+        self._writer_idle.set()
+        self._writer_stopping = False
+        self._writer = threading.Thread(target=self._writer_loop, name="recipe-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self._shutdown)
         
     def load_price_data(self) -> Dict:
         """Load ingredient price data from JSON file."""
-        if os.path.exists(self.price_file):
+        if os.path.isfile(self.price_file):
             try:
-                with open(self.price_file, 'r') as file:
-                    return json.load(file)
-            except json.JSONDecodeError:
+                with open(self.price_file, 'rb') as file:
+                    price_data = _json_loads(file.read())
+                # Lowercase keys once here rather than on every lookup
+                price_data = {sys.intern(key.lower()): info for key, info in price_data.items()}
+                for info in price_data.values():
+                    measurement = info.get("measurement")
+                    if isinstance(measurement, str):
+                        info["measurement"] = sys.intern(measurement)
+                return price_data
+            except ValueError:  # json and orjson decode errors both subclass ValueError
                 print(f"Error reading {self.price_file}, creating empty price database.")
                 return {}
         else:
             print(f"Price file {self.price_file} not found, creating empty price database.")
             return {}
     
-    def save_price_data(self) -> None:
-        """Save ingredient price data to JSON file."""
-        with open(self.price_file, 'w') as file:
-            json.dump(self.price_data, file, indent=2)
+    def save_price_data(self, sync: bool = False) -> bool:
+        """Save ingredient price data to JSON file, returning whether it succeeded."""
+        # Kept indented since the price list is small and edited by hand
+        try:
+            _write_file_atomic(self.price_file, _json_dumps(self.price_data, indent=True), sync)
+        except OSError as e:
+            print(f"Error saving {self.price_file}: {e}")
+            return False
         print(f"Price data saved to {self.price_file}")
+        return True
     
     def load_recipes(self) -> Dict:
         """Load recipes from JSON file or create a new structure."""
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r') as file:
-                    return json.load(file)
-            except json.JSONDecodeError:
-                print(f"Error reading {self.data_file}, creating new recipe database.")
-                return {"folders": {}, "recipes": {}}
-        else:
+        try:
+            with open(self.data_file, 'rb') as file:
+                recipes = _json_loads(file.read())
+        except (FileNotFoundError, IsADirectoryError):
             return {"folders": {}, "recipes": {}}
+        except ValueError:  # json and orjson decode errors both subclass ValueError
+            print(f"Error reading {self.data_file}, creating new recipe database.")
+            return {"folders": {}, "recipes": {}}
+        self._intern_names(recipes)
+        return recipes
+    
+    @staticmethod
+    def _intern_names(root: Dict) -> None:
+        """Intern all folder, recipe and ingredient names and units in a loaded recipe tree."""
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            node["folders"] = {sys.intern(name): folder for name, folder in node["folders"].items()}
+            node["recipes"] = {sys.intern(name): recipe for name, recipe in node["recipes"].items()}
+            for recipe in node["recipes"].values():
+                ingredients = recipe.get("ingredients")
+                if isinstance(ingredients, dict):
+                    recipe["ingredients"] = {sys.intern(name): info for name, info in ingredients.items()}
+                    # Units are looked up in the unit converter's tables
+                    for info in ingredients.values():
+                        unit = info.get("unit")
+                        if isinstance(unit, str):
+                            info["unit"] = sys.intern(unit)
+                elif isinstance(ingredients, list):
+                    recipe["ingredients"] = [sys.intern(name) if isinstance(name, str) else name
+                                             for name in ingredients]
+            stack.extend(node["folders"].values())
+    
+    def save_recipes(self, sync: bool = False) -> None:
+        """Save recipes to JSON file in the background, optionally syncing it to disk."""
+        # Serialize here, since the tree may change as soon as we return, and
+        # leave only the file writing to the writer thread. A newer snapshot
+        # replaces one that hasn't been written yet.
+        payload = _json_dumps(self.recipes)
+        if self._writer_stopping:
+            # The writer has already exited, so this is the final save on
+            # shutdown. Write it here.
+            self._write_recipes_file(payload, sync)
+            self._print_write_reports()
+        else:
+            # The writer records the outcome once the file is written
+            with self._writer_lock:
+                self._pending_payload = payload
+                # A sync asked for by a snapshot this one replaces still applies
+                self._pending_sync = self._pending_sync or sync
+                self._writer_idle.clear()
+                self._writer_event.set()
+    
+    def _write_recipes_file(self, payload: bytes, sync: bool = False) -> bool:
+        """Write serialized recipes to the data file, returning whether it succeeded."""
+        try:
+            _write_file_atomic(self.data_file, payload, sync)
+        except OSError as e:
+            with self._writer_lock:
+                self._write_reports.append(f"Error saving {self.data_file}: {e}")
+                # Mark the recipes unsaved again so 'save' and exiting retry
+                self._recipes_dirty = True
+            return False
+        with self._writer_lock:
+            self._write_reports.append(f"Recipes saved to {self.data_file}")
+        return True
+    
+    def _print_write_reports(self) -> None:
+        """Print the outcome of recipe writes finished since the last call."""
+        with self._writer_lock:
+            reports, self._write_reports = self._write_reports, []
+        if reports:
+            sys.stdout.write("\n".join(reports) + "\n")
+    
+    def _writer_loop(self) -> None:
+        """Write queued recipe snapshots until the writer is stopped."""
+        while True:
+            self._writer_event.wait()
+            with self._writer_lock:
+                self._writer_event.clear()
+                payload, self._pending_payload = self._pending_payload, None
+                sync, self._pending_sync = self._pending_sync, False
+                stopping = self._writer_stopping
+            if payload is not None:
+                # Threshold autosaves skip fsync, but the last snapshot
+                # written before exiting is always synced
+                self._write_recipes_file(payload, sync or stopping)
+            with self._writer_lock:
+                if self._pending_payload is None:
+                    self._writer_idle.set()
+            if stopping:
+                return
     
-    def save_recipes(self) -> None:
-        """Save recipes to JSON file."""
-        with open(self.data_file, 'w') as file:
-            json.dump(self.recipes, file, indent=2)
-        print(f"Recipes saved to {self.data_file}")
+    def _shutdown(self) -> None:
+        """Stop the writer thread, then save any unsaved changes."""
+        # Runs once, from 'exit' or at interpreter exit, so a failed final
+        # save isn't retried and reported twice
+        atexit.unregister(self._shutdown)
+        if self._writer.is_alive():
+            with self._writer_lock:
+                self._writer_stopping = True
+                self._writer_event.set()
+            self._writer.join()
+        self._print_write_reports()
+        self._flush_all(sync=True)
+    
+    def _mark_dirty(self, prices: bool = False) -> None:
+        """Record an unsaved recipe (or price) change, saving once enough have piled up."""
+        if prices:
+            self._prices_dirty = True
+        else:
+            self._recipes_dirty = True
+        self._mutation_count += 1
+        if self._mutation_count >= AUTOSAVE_MUTATIONS:
+            self._flush_all()
+    
+    def _flush_all(self, sync: bool = False) -> None:
+        """Save recipes and price data if they have unsaved changes."""
+        # Threshold autosaves skip fsync; 'save' and exiting pass sync=True
+        if self._recipes_dirty:
+            # Cleared before saving, since a failed write sets it again
+            self._recipes_dirty = False
+            self.save_recipes(sync)
+        # Left dirty if the write fails, so 'save' and exiting retry it
+        if self._prices_dirty and self.save_price_data(sync):
+            self._prices_dirty = False
+        self._mutation_count = 0
+    
+    @staticmethod
+    def _recipe_tokens(name_lower: str, ingredients_lower: Tuple[str, ...]) -> Set[str]:
+        """Get the search tokens for a recipe's lowercased name and ingredients."""
+        tokens = set(_tokenize(name_lower))
+        for ingredient in ingredients_lower:
+            tokens.update(_tokenize(ingredient))
+        return tokens
+    
+    def _index_recipe(self, path: Tuple[str, ...], recipe_name: str, recipe_data: Dict) -> None:
+        """Add a recipe to the search index."""
+        entry = (path, recipe_name)
+        name_lower = self._lower(recipe_name)
+        # Iterating works for both the dict and the legacy list ingredient formats
+        ingredients_lower = tuple(self._lower(ingredient) for ingredient in recipe_data["ingredients"])
+        self._indexed_recipes[entry] = (recipe_data, name_lower, ingredients_lower)
+        for token in self._recipe_tokens(name_lower, ingredients_lower):
+            self._index.setdefault(token, set()).add(entry)
+    
+    def _unindex_recipe(self, path: Tuple[str, ...], recipe_name: str) -> None:
+        """Remove a recipe from the search index."""
+        entry = (path, recipe_name)
+        _, name_lower, ingredients_lower = self._indexed_recipes.pop(entry)
+        for token in self._recipe_tokens(name_lower, ingredients_lower):
+            entries = self._index.get(token)
+            if entries is not None:
+                entries.discard(entry)
+                if not entries:
+                    del self._index[token]
+    
+    def _rebuild_index(self) -> None:
+        """Build the search index from the whole recipe tree."""
+        self._index = {}
+        self._indexed_recipes = {}
+        
+        # Walk the tree with an explicit stack rather than recursion
+        stack = [(self.recipes, ())]
+        while stack:
+            node, path = stack.pop()
+            for recipe_name, recipe_data in node["recipes"].items():
+                self._index_recipe(path, recipe_name, recipe_data)
+            
+            stack.extend((folder_data, path + (folder_name,))
+                         for folder_name, folder_data in node["folders"].items())
+    
+    def _lower(self, name: str) -> str:
+        """Lowercase a name, reusing the cached result for names seen before."""
+        try:
+            return self._lowercase_names[name]
+        except KeyError:
+            lowered = self._lowercase_names[name] = sys.intern(name.lower())
+            return lowered
+    
+    def _sorted_names(self, node: Dict) -> Tuple[List[str], List[str]]:
+        """Get a folder's sorted folder and recipe names, sorting only after changes."""
+        try:
+            return self._sort_cache[id(node)]
+        except KeyError:
+            names = self._sort_cache[id(node)] = (sorted(node["folders"]), sorted(node["recipes"]))
+            return names
+    
+    def _invalidate_sorted_names(self, node: Dict) -> None:
+        """Forget a folder's sorted names after adding or removing entries."""
+        self._sort_cache.pop(id(node), None)
     
     def get_current_node(self) -> Dict:
         """Get the node at current path."""
-        node = self.recipes
-        for folder in self.current_path:
-            node = node["folders"][folder]
-        return node
+        return self.current_node
     
     def display_current_path(self) -> None:
         """Display current directory path."""
-        if not self.current_path:
-            path_display = "/"
-        else:
-            path_display = "/" + "/".join(self.current_path)
-        print(f"Current location: {path_display}")
+        print(f"Current location: {self._path_str}")
     
     def list_content(self) -> None:
         """List all folders and recipes in current directory."""
-        current = self.get_current_node()
+        current = self.current_node
+        folder_names, recipe_names = self._sorted_names(current)
         
-        print("\nFolders:")
-        if current["folders"]:
-            for folder in sorted(current["folders"].keys()):
-                print(f"  📁 {folder}")
+        lines = ["", "Folders:"]
+        if folder_names:
+            lines.extend(f"  📁 {folder}" for folder in folder_names)
         else:
-            print("  (No folders)")
+            lines.append("  (No folders)")
         
-        print("\nRecipes:")
-        if current["recipes"]:
-            for recipe in sorted(current["recipes"].keys()):
-                recipe_data = current["recipes"][recipe]
+        lines.extend(["", "Recipes:"])
+        if recipe_names:
+            recipes = current["recipes"]
+            for recipe in recipe_names:
+                recipe_data = recipes[recipe]
                 price = self.calculate_recipe_price(recipe_data)
                 price_display = f"(Est: ${price:.2f})" if price is not None else ""
-                print(f"  📝 {recipe} {price_display}")
+                lines.append(f"  📝 {recipe} {price_display}")
         else:
-            print("  (No recipes)")
-        print()
+            lines.append("  (No recipes)")
+        
+        # Write the whole listing at once instead of one print per entry
+        sys.stdout.write("\n".join(lines) + "\n\n")
     
     def calculate_ingredient_price(self, ingredient_name: str, amount: float, unit: str) -> Optional[float]:
         """Calculate the price of a single ingredient."""
-        ingredient_key = ingredient_name.lower()
+        ingredient_key = self._lower(ingredient_name)
+        try:
+            factor = self._factor_cache[(ingredient_key, unit)]
+        except KeyError:
+            factor = self._price_factor(ingredient_name, ingredient_key, unit)
+            self._factor_cache[(ingredient_key, unit)] = factor
         
+        if factor is None:
+            return None
+        return amount * factor
+    
+    def _price_factor(self, ingredient_name: str, ingredient_key: str, unit: str) -> Optional[float]:
+        """Get the price of one unit of an ingredient, or None if it can't be priced."""
         if ingredient_key in self.price_data:
             price_info = self.price_data[ingredient_key]
             price_per_unit = price_info.get("price", 0)
@@ -99,25 +437,44 @@ class RecipeManager:
             # Convert units if needed
             if unit != price_unit and unit and price_unit:
                 try:
-                    converted_amount = UnitConverter.convert(amount, unit, price_unit)
-                    return converted_amount * price_per_unit
+                    return UnitConverter.convert(1.0, unit, price_unit) * price_per_unit
                 except Exception as e:
                     print(f"Warning: Could not convert {unit} to {price_unit} for {ingredient_name}: {e}")
                     return None
             else:
-                return amount * price_per_unit
+                return price_per_unit
         
         return None
     
     def calculate_recipe_price(self, recipe_data: Dict) -> Optional[float]:
+        """Calculate the total price of a recipe based on ingredients, reusing cached results."""
+        cached = self._recipe_price_cache.get(id(recipe_data))
+        if cached is not None and cached[0] == self._price_version:
+            return cached[1]
+        
+        price = self._compute_recipe_price(recipe_data)
+        self._recipe_price_cache[id(recipe_data)] = (self._price_version, price)
+        return price
+    
+    def _invalidate_recipe_price(self, recipe_data: Dict) -> None:
+        """Drop the cached price of a recipe after it is created, edited or deleted."""
+        self._recipe_price_cache.pop(id(recipe_data), None)
+    
+    def _compute_recipe_price(self, recipe_data: Dict) -> Optional[float]:
         """Calculate the total price of a recipe based on ingredients."""
-        if "ingredients" not in recipe_data or not recipe_data["ingredients"]:
+        ingredients = recipe_data.get("ingredients")
+        if not ingredients:
+            return None
+        
+        # Price data keys are lowercased, so this skips recipes with no
+        # priced ingredients without working out any per-unit prices
+        if not any(self._lower(name) in self.price_data for name in ingredients):
             return None
         
         total_price = 0.0
-        missing_prices = []
+        priced = False
         
-        for ingredient_name, ingredient_info in recipe_data["ingredients"].items():
+        for ingredient_name, ingredient_info in ingredients.items():
             amount = ingredient_info.get("amount", 0)
             unit = ingredient_info.get("unit", "")
             
@@ -125,27 +482,25 @@ class RecipeManager:
             
             if ingredient_price is not None:
                 total_price += ingredient_price
-            else:
-                missing_prices.append(ingredient_name)
-        
-        if missing_prices:
-            if len(missing_prices) == len(recipe_data["ingredients"]):
-                return None
+                priced = True
         
-        return total_price
+        # None when no ingredient could be priced (e.g. incompatible units)
+        return total_price if priced else None
     
     def enter_folder(self, folder_name: str) -> bool:
         """Enter a folder if it exists, with case-insensitive matching."""
-        current = self.get_current_node()
+        current = self.current_node
         
         # Create a dictionary mapping lowercase folder names to their actual names
-        folder_name_map = {name.lower(): name for name in current["folders"]}
+        folder_name_map = {self._lower(name): name for name in current["folders"]}
         
-        # Check if the lowercase version of the requested folder exists
-        if folder_name.lower() in folder_name_map:
-            # Use the actual folder name with correct capitalization
-            actual_folder_name = folder_name_map[folder_name.lower()]
+        # The map gives the actual folder name with correct capitalization
+        actual_folder_name = folder_name_map.get(folder_name.lower())
+        if actual_folder_name is not None:
             self.current_path.append(actual_folder_name)
+            self.current_node = current["folders"][actual_folder_name]
+            self._node_stack.append(self.current_node)
+            self._path_str = "/" + "/".join(self.current_path)
             return True
         else:
             print(f"Folder '{folder_name}' doesn't exist!")
@@ -155,6 +510,9 @@ class RecipeManager:
         """Go up one level if not at root."""
         if self.current_path:
             self.current_path.pop()
+            self._node_stack.pop()
+            self.current_node = self._node_stack[-1]
+            self._path_str = "/" + "/".join(self.current_path)
             return True
         else:
             print("Already at root directory!")
@@ -162,40 +520,37 @@ class RecipeManager:
     
     def create_folder(self, folder_name: str) -> None:
         """Create new folder in current directory."""
-        current = self.get_current_node()
+        current = self.current_node
         if folder_name in current["folders"]:
             print(f"Folder '{folder_name}' already exists!")
         else:
             current["folders"][folder_name] = {"folders": {}, "recipes": {}}
-            self.save_recipes()
+            self._invalidate_sorted_names(current)
+            self._mark_dirty()
             print(f"Folder '{folder_name}' created!")
     
     def view_recipe(self, recipe_name: str) -> None:
         """View a recipe if it exists, showing ingredient prices, with case-insensitive matching."""
-        current = self.get_current_node()
+        current = self.current_node
         
         # Create a dictionary mapping lowercase recipe names to their actual names
-        recipe_name_map = {name.lower(): name for name in current["recipes"]}
+        recipe_name_map = {self._lower(name): name for name in current["recipes"]}
         
-        # Check if the lowercase version of the requested recipe exists
-        if recipe_name.lower() in recipe_name_map:
-            # Use the actual recipe name with correct capitalization
-            actual_recipe_name = recipe_name_map[recipe_name.lower()]
+        # The map gives the actual recipe name with correct capitalization
+        actual_recipe_name = recipe_name_map.get(recipe_name.lower())
+        if actual_recipe_name is not None:
             recipe = current["recipes"][actual_recipe_name]
             
-            print("\n" + "=" * 50)
-            print(f"Recipe: {actual_recipe_name}")
-            print("=" * 50)
+            lines = ["", "=" * 50, f"Recipe: {actual_recipe_name}", "=" * 50]
             
-            # Rest of the view_recipe functionality remains the same
             # Calculate and display total price
             total_price = self.calculate_recipe_price(recipe)
             if total_price is not None:
-                print(f"\nTotal Estimated Cost: ${total_price:.2f}")
+                lines.extend(["", f"Total Estimated Cost: ${total_price:.2f}"])
             else:
-                print("\nTotal Estimated Cost: Unknown (missing price data)")
+                lines.extend(["", "Total Estimated Cost: Unknown (missing price data)"])
             
-            print("\nIngredients:")
+            lines.extend(["", "Ingredients:"])
             if isinstance(recipe["ingredients"], dict):
                 # New format with amounts and units
                 missing_prices = []
@@ -219,59 +574,40 @@ class RecipeManager:
                     
                     # Add price information
                     if ingredient_price is not None:
-                        print(f"{ingredient_text} (${ingredient_price:.2f})")
+                        lines.append(f"{ingredient_text} (${ingredient_price:.2f})")
                     else:
-                        print(f"{ingredient_text} (price unknown)")
+                        lines.append(f"{ingredient_text} (price unknown)")
                         missing_prices.append(ingredient)
                 
                 # Notify about missing prices
                 if missing_prices:
-                    print(f"\nNote: Missing price data for: {', '.join(missing_prices)}")
+                    lines.extend(["", f"Note: Missing price data for: {', '.join(missing_prices)}"])
             else:
                 # Legacy format
-                for ingredient in recipe["ingredients"]:
-                    print(f"  • {ingredient}")
+                lines.extend(f"  • {ingredient}" for ingredient in recipe["ingredients"])
             
-            print("\nInstructions:\n")
+            lines.extend(["", "Instructions:", ""])
             
-            # Split by lines, and print each line with text wrapping
-            instructions = recipe["instructions"].split("\n")
-            
-            i = 1
-            for line in instructions:
-                # Print instruction number
-                print(str(i) + ". ", end="")
-                i += 1
-                
-                wrapped_line = textwrap.wrap(line, width=70)
-                
-                # Indent lines that aren't 1st to be in line with numbered list
-                first = True
-                for sub_line in wrapped_line:
-                    print(f"   {sub_line}" if first is False else sub_line)
-                    first = False
-                        
-                print() # Line between steps
+            # Number each instruction line and wrap it, indenting continuation
+            # lines to line up with the numbered list
+            for i, line in enumerate(recipe["instructions"].split("\n"), 1):
+                wrapped_line = _wrap(line) or ("",)
+                lines.append(f"{i}. {wrapped_line[0]}")
+                lines.extend(f"   {sub_line}" for sub_line in wrapped_line[1:])
+                lines.append("") # Line between steps
             
             if "notes" in recipe and recipe["notes"]:
-                print("Notes:")
-                notes = recipe["notes"]
-                wrapped_notes = textwrap.wrap(notes, width=70)
-                for line in wrapped_notes:
-                    print(f"  {line}")
+                lines.append("Notes:")
+                lines.extend(f"  {line}" for line in _wrap(recipe["notes"]))
             
-            print("=" * 50 + "\n")
+            lines.extend(["=" * 50, ""])
+            # Write the whole recipe at once instead of one print per line
+            sys.stdout.write("\n".join(lines) + "\n")
         else:
             print(f"Recipe '{recipe_name}' doesn't exist!")
     
-    def create_recipe(self, recipe_name: str) -> None:
-        """Create a new recipe with structured ingredients."""
-        current = self.get_current_node()
-        if recipe_name in current["recipes"]:
-            print(f"Recipe '{recipe_name}' already exists! Use 'edit' command to modify it.")
-            return
-        
-        print(f"\nCreating new recipe: {recipe_name}")
+    def _read_ingredients(self) -> Dict:
+        """Read ingredient lines from the user until an empty line is entered."""
         ingredients = {}
         print("Enter ingredients (format: ingredient amount unit, empty line to finish):")
         print("Example: Shrimp 1 lb")
@@ -281,38 +617,38 @@ class RecipeManager:
             if not ingredient_line:
                 break
             
-            # Parse the ingredient line
-            parts = ingredient_line.split()
-            if len(parts) < 1:
-                print("Invalid format. Please enter at least the ingredient name.")
+            # Common case: name followed by an amount and optional unit
+            match = _INGREDIENT_RE.match(ingredient_line)
+            if match:
+                details = {"amount": float(match["amount"])}
+                if match["unit"]:
+                    details["unit"] = match["unit"]
+                # Collapse runs of whitespace inside the name
+                ingredients[" ".join(match["name"].split())] = details
                 continue
-                
+            
+            parts = ingredient_line.split()
             if len(parts) == 1:
                 # Just ingredient name
-                ingredient_name = parts[0]
-                ingredients[ingredient_name] = {}
-            elif len(parts) >= 3:
-                # Ingredient with amount and unit
-                # The ingredient name might have spaces, so join everything except the last two parts
-                amount_index = len(parts) - 2
-                ingredient_name = " ".join(parts[:amount_index])
-                try:
-                    amount = float(parts[amount_index])
-                    unit = parts[amount_index + 1]
-                    ingredients[ingredient_name] = {"amount": amount, "unit": unit}
-                except ValueError:
-                    print("Invalid amount format. Using as ingredient name only.")
-                    ingredient_name = ingredient_line
-                    ingredients[ingredient_name] = {}
+                ingredients[ingredient_line] = {}
             elif len(parts) == 2:
-                # Try to parse the second part as a number
-                ingredient_name = parts[0]
-                try:
-                    amount = float(parts[1])
-                    ingredients[ingredient_name] = {"amount": amount}
-                except ValueError:
-                    # If not a number, treat as a unit
-                    ingredients[ingredient_name] = {"unit": parts[1]}
+                # Second part isn't a number, so treat it as a unit
+                ingredients[parts[0]] = {"unit": parts[1]}
+            else:
+                print("Invalid amount format. Using as ingredient name only.")
+                ingredients[ingredient_line] = {}
+        
+        return ingredients
+    
+    def create_recipe(self, recipe_name: str) -> None:
+        """Create a new recipe with structured ingredients."""
+        current = self.current_node
+        if recipe_name in current["recipes"]:
+            print(f"Recipe '{recipe_name}' already exists! Use 'edit' command to modify it.")
+            return
+        
+        print(f"\nCreating new recipe: {recipe_name}")
+        ingredients = self._read_ingredients()
         
         print("\nEnter instructions (multi-line, type 'END' on a new line to finish):")
         instructions_lines = []
@@ -337,8 +673,11 @@ class RecipeManager:
             "instructions": instructions,
             "notes": notes
         }
+        self._index_recipe(tuple(self.current_path), recipe_name, current["recipes"][recipe_name])
+        self._invalidate_recipe_price(current["recipes"][recipe_name])
+        self._invalidate_sorted_names(current)
         
-        self.save_recipes()
+        self._mark_dirty()
         print(f"Recipe '{recipe_name}' created successfully!")
         
         # Calculate and show price
@@ -350,21 +689,22 @@ class RecipeManager:
     
     def edit_recipe(self, recipe_name: str) -> None:
         """Edit an existing recipe, with case-insensitive matching."""
-        current = self.get_current_node()
+        current = self.current_node
         
         # Create a dictionary mapping lowercase recipe names to their actual names
-        recipe_name_map = {name.lower(): name for name in current["recipes"]}
+        recipe_name_map = {self._lower(name): name for name in current["recipes"]}
         
-        # Check if the lowercase version of the requested recipe exists
-        if recipe_name.lower() in recipe_name_map:
-            # Use the actual recipe name with correct capitalization
-            actual_recipe_name = recipe_name_map[recipe_name.lower()]
+        # The map gives the actual recipe name with correct capitalization
+        actual_recipe_name = recipe_name_map.get(recipe_name.lower())
+        if actual_recipe_name is not None:
             recipe = current["recipes"][actual_recipe_name]
+            # Re-indexed below once the edits are done
+            self._unindex_recipe(tuple(self.current_path), actual_recipe_name)
             
-            print(f"\nEditing recipe: {actual_recipe_name}")
+            lines = ["", f"Editing recipe: {actual_recipe_name}"]
             
             # Display current ingredients
-            print("\nCurrent ingredients:")
+            lines.extend(["", "Current ingredients:"])
             if isinstance(recipe["ingredients"], dict):
                 # New format
                 for i, (ingredient, details) in enumerate(recipe["ingredients"].items(), 1):
@@ -388,67 +728,23 @@ class RecipeManager:
                     
                     # Add price
                     if ingredient_price is not None:
-                        print(f"{ingredient_text} (${ingredient_price:.2f})")
+                        lines.append(f"{ingredient_text} (${ingredient_price:.2f})")
                     else:
-                        print(f"{ingredient_text} (price unknown)")
+                        lines.append(f"{ingredient_text} (price unknown)")
             else:
                 # Legacy format
-                for i, ingredient in enumerate(recipe["ingredients"], 1):
-                    print(f"  {i}. {ingredient}")
+                lines.extend(f"  {i}. {ingredient}" for i, ingredient in enumerate(recipe["ingredients"], 1))
             
-            choice = input("\nEdit ingredients? (y/n): ").lower()
-            if choice == 'y':
-                ingredients = {}
-                print("Enter ingredients (format: ingredient amount unit, empty line to finish):")
-                print("Example: Shrimp 1 lb")
-                
-                while True:
-                    ingredient_line = input("> ").strip()
-                    if not ingredient_line:
-                        break
-                    
-                    # Parse the ingredient line
-                    parts = ingredient_line.split()
-                    if len(parts) < 1:
-                        print("Invalid format. Please enter at least the ingredient name.")
-                        continue
-                        
-                    if len(parts) == 1:
-                        # Just ingredient name
-                        ingredient_name = parts[0]
-                        ingredients[ingredient_name] = {}
-                    elif len(parts) >= 3:
-                        # Ingredient with amount and unit
-                        # The ingredient name might have spaces, so join everything except the last two parts
-                        amount_index = len(parts) - 2
-                        ingredient_name = " ".join(parts[:amount_index])
-                        try:
-                            amount = float(parts[amount_index])
-                            unit = parts[amount_index + 1]
-                            ingredients[ingredient_name] = {"amount": amount, "unit": unit}
-                        except ValueError:
-                            print("Invalid amount format. Using as ingredient name only.")
-                            ingredient_name = ingredient_line
-                            ingredients[ingredient_name] = {}
-                    elif len(parts) == 2:
-                        # Try to parse the second part as a number
-                        ingredient_name = parts[0]
-                        try:
-                            amount = float(parts[1])
-                            ingredients[ingredient_name] = {"amount": amount}
-                        except ValueError:
-                            # If not a number, treat as a unit
-                            ingredients[ingredient_name] = {"unit": parts[1]}
-                
-                recipe["ingredients"] = ingredients
+            sys.stdout.write("\n".join(lines) + "\n")
             
-            print("\nCurrent instructions:")
-            wrapped_instructions = textwrap.wrap(recipe["instructions"], width=70)
-            for line in wrapped_instructions:
-                print(f"  {line}")
+            if _yes("\nEdit ingredients? (y/n): "):
+                recipe["ingredients"] = self._read_ingredients()
             
-            choice = input("\nEdit instructions? (y/n): ").lower()
-            if choice == 'y':
+            lines = ["", "Current instructions:"]
+            lines.extend(f"  {line}" for line in _wrap(recipe["instructions"]))
+            sys.stdout.write("\n".join(lines) + "\n")
+            
+            if _yes("\nEdit instructions? (y/n): "):
                 print("Enter instructions (multi-line, type 'END' on a new line to finish):")
                 instructions_lines = []
                 while True:
@@ -458,16 +754,14 @@ class RecipeManager:
                     instructions_lines.append(line)
                 recipe["instructions"] = " ".join(instructions_lines)
             
-            print("\nCurrent notes:")
+            lines = ["", "Current notes:"]
             if "notes" in recipe and recipe["notes"]:
-                wrapped_notes = textwrap.wrap(recipe["notes"], width=70)
-                for line in wrapped_notes:
-                    print(f"  {line}")
+                lines.extend(f"  {line}" for line in _wrap(recipe["notes"]))
             else:
-                print("  (No notes)")
+                lines.append("  (No notes)")
+            sys.stdout.write("\n".join(lines) + "\n")
             
-            choice = input("\nEdit notes? (y/n): ").lower()
-            if choice == 'y':
+            if _yes("\nEdit notes? (y/n): "):
                 print("Enter notes (multi-line, type 'END' on a new line to finish):")
                 notes_lines = []
                 while True:
@@ -477,7 +771,9 @@ class RecipeManager:
                     notes_lines.append(line)
                 recipe["notes"] = " ".join(notes_lines)
             
-            self.save_recipes()
+            self._index_recipe(tuple(self.current_path), actual_recipe_name, recipe)
+            self._invalidate_recipe_price(recipe)
+            self._mark_dirty()
             print(f"Recipe '{actual_recipe_name}' updated successfully!")
             
             # Calculate and show updated price
@@ -493,24 +789,27 @@ class RecipeManager:
             "price": price,
             "measurement": measurement
         }
-        self.save_price_data()
+        self._price_version += 1
+        self._factor_cache.clear()
+        self._mark_dirty(prices=True)
         print(f"Price data for '{ingredient_name}' added/updated.")
     
     def delete_recipe(self, recipe_name: str) -> None:
         """Delete a recipe if it exists, with case-insensitive matching."""
-        current = self.get_current_node()
+        current = self.current_node
         
         # Create a dictionary mapping lowercase recipe names to their actual names
-        recipe_name_map = {name.lower(): name for name in current["recipes"]}
-        
-        # Check if the lowercase version of the requested recipe exists
-        if recipe_name.lower() in recipe_name_map:
-            # Use the actual recipe name with correct capitalization
-            actual_recipe_name = recipe_name_map[recipe_name.lower()]
-            confirm = input(f"Are you sure you want to delete '{actual_recipe_name}'? (y/n): ").lower()
-            if confirm == 'y':
+        recipe_name_map = {self._lower(name): name for name in current["recipes"]}
+        
+        # The map gives the actual recipe name with correct capitalization
+        actual_recipe_name = recipe_name_map.get(recipe_name.lower())
+        if actual_recipe_name is not None:
+            if _yes(f"Are you sure you want to delete '{actual_recipe_name}'? (y/n): "):
+                self._unindex_recipe(tuple(self.current_path), actual_recipe_name)
+                self._invalidate_recipe_price(current["recipes"][actual_recipe_name])
                 del current["recipes"][actual_recipe_name]
-                self.save_recipes()
+                self._invalidate_sorted_names(current)
+                self._mark_dirty()
                 print(f"Recipe '{actual_recipe_name}' deleted!")
             else:
                 print("Deletion cancelled.")
@@ -519,16 +818,19 @@ class RecipeManager:
     
     def delete_folder(self, folder_name: str) -> None:
         """Delete a folder if it exists and is empty."""
-        current = self.get_current_node()
-        if folder_name in current["folders"]:
-            folder = current["folders"][folder_name]
+        current = self.current_node
+        folder = current["folders"].get(folder_name)
+        if folder is not None:
             if folder["folders"] or folder["recipes"]:
                 print(f"Folder '{folder_name}' is not empty! Delete contents first.")
             else:
-                confirm = input(f"Are you sure you want to delete folder '{folder_name}'? (y/n): ").lower()
-                if confirm == 'y':
+                if _yes(f"Are you sure you want to delete folder '{folder_name}'? (y/n): "):
                     del current["folders"][folder_name]
-                    self.save_recipes()
+                    # Drop the deleted folder's entry too, as a new folder
+                    # could later reuse its id()
+                    self._invalidate_sorted_names(folder)
+                    self._invalidate_sorted_names(current)
+                    self._mark_dirty()
                     print(f"Folder '{folder_name}' deleted!")
                 else:
                     print("Deletion cancelled.")
@@ -537,7 +839,7 @@ class RecipeManager:
     
     def move_recipe(self, recipe_name: str, destination_path: str) -> None:
         """Move a recipe to a different folder."""
-        current = self.get_current_node()
+        current = self.current_node
         if recipe_name not in current["recipes"]:
             print(f"Recipe '{recipe_name}' doesn't exist!")
             return
@@ -546,35 +848,45 @@ class RecipeManager:
         path_parts = [p for p in destination_path.split("/") if p]
         
         # Navigate to destination
+        # Keep the nodes along the path alongside the folder names so '..'
+        # can step back without walking down from the root again
         if destination_path.startswith("/"):
             # Absolute path
-            dest_node = self.recipes
+            node_stack = [self.recipes]
             full_path = []
         else:
             # Relative path
-            dest_node = self.get_current_node()
+            node_stack = self._node_stack.copy()
             full_path = self.current_path.copy()
         
         for part in path_parts:
             if part == "..":
                 if full_path:
                     full_path.pop()
-                    # Recalculate dest_node based on new full_path
-                    dest_node = self.recipes
-                    for folder in full_path:
-                        dest_node = dest_node["folders"][folder]
-            elif part in dest_node["folders"]:
-                full_path.append(part)
-                dest_node = dest_node["folders"][part]
+                    node_stack.pop()
             else:
-                print(f"Destination folder '{part}' doesn't exist!")
-                return
+                folder = node_stack[-1]["folders"].get(part)
+                if folder is None:
+                    print(f"Destination folder '{part}' doesn't exist!")
+                    return
+                full_path.append(part)
+                node_stack.append(folder)
+        dest_node = node_stack[-1]
+        
+        # Don't replace a different recipe of the same name at the destination
+        if dest_node is not current and recipe_name in dest_node["recipes"]:
+            dest_path_str = "/" + "/".join(full_path) if full_path else "/"
+            print(f"Recipe '{recipe_name}' already exists in {dest_path_str}!")
+            return
         
         # Perform the move
-        recipe_data = current["recipes"][recipe_name]
+        recipe_data = current["recipes"].pop(recipe_name)
         dest_node["recipes"][recipe_name] = recipe_data
-        del current["recipes"][recipe_name]
-        self.save_recipes()
+        self._invalidate_sorted_names(current)
+        self._invalidate_sorted_names(dest_node)
+        self._unindex_recipe(tuple(self.current_path), recipe_name)
+        self._index_recipe(tuple(full_path), recipe_name, recipe_data)
+        self._mark_dirty()
         
         # Display the path where recipe was moved
         dest_path_str = "/" + "/".join(full_path) if full_path else "/"
@@ -583,54 +895,117 @@ class RecipeManager:
     def search_recipes(self, query: str) -> None:
         """Search for recipes containing the query in name or ingredients."""
         results = []
+        query_lower = query.lower()
         
-        def search_node(node, path):
-            for recipe_name, recipe_data in node["recipes"].items():
-                # Search in name
-                if query.lower() in recipe_name.lower():
-                    results.append((path, recipe_name, "name"))
-                    continue
-                
-                # Search in ingredients
-                if isinstance(recipe_data["ingredients"], dict):
-                    # New format
-                    for ingredient in recipe_data["ingredients"].keys():
-                        if query.lower() in ingredient.lower():
-                            results.append((path, recipe_name, "ingredient"))
-                            break
-                else:
-                    # Legacy format
-                    for ingredient in recipe_data["ingredients"]:
-                        if query.lower() in ingredient.lower():
-                            results.append((path, recipe_name, "ingredient"))
-                            break
-            
-            for folder_name, folder_data in node["folders"].items():
-                new_path = path + [folder_name]
-                search_node(folder_data, new_path)
+        # Narrow down to recipes that have, for every word in the query, a
+        # token containing that word. Any real match is among these.
+        candidates = None
+        for query_token in _tokenize(query_lower):
+            matches = set()
+            for token, entries in self._index.items():
+                if query_token in token:
+                    matches |= entries
+            candidates = matches if candidates is None else candidates & matches
         
-        search_node(self.recipes, [])
+        if candidates is None:
+            # No word characters in the query, so every recipe is a candidate,
+            # including ones whose name and ingredients have no tokens at all
+            candidates = set(self._indexed_recipes)
+        
+        # Confirm the full query against each candidate
+        for path, recipe_name in sorted(candidates):
+            recipe_data, name_lower, ingredients_lower = self._indexed_recipes[(path, recipe_name)]
+            
+            # Search in name
+            if query_lower in name_lower:
+                results.append((path, recipe_name, recipe_data, "name"))
+                continue
+            
+            # Search in ingredients
+            for ingredient in ingredients_lower:
+                if query_lower in ingredient:
+                    results.append((path, recipe_name, recipe_data, "ingredient"))
+                    break
         
         if results:
-            print(f"\nFound {len(results)} results for '{query}':")
-            for path, recipe_name, match_type in results:
+            lines = ["", f"Found {len(results)} results for '{query}':"]
+            for path, recipe_name, recipe_data, match_type in results:
                 path_str = "/" + "/".join(path) if path else "/"
-                price = None
-                
-                # Get the recipe to calculate price
-                node = self.recipes
-                for folder in path:
-                    node = node["folders"][folder]
-                
-                if recipe_name in node["recipes"]:
-                    price = self.calculate_recipe_price(node["recipes"][recipe_name])
+                price = self.calculate_recipe_price(recipe_data)
                 
                 price_display = f" (Est: ${price:.2f})" if price is not None else ""
                 match_info = f"matched in {match_type}"
-                print(f"  {recipe_name}{price_display} (in {path_str}) - {match_info}")
+                lines.append(f"  {recipe_name}{price_display} (in {path_str}) - {match_info}")
+            sys.stdout.write("\n".join(lines) + "\n")
         else:
             print(f"No recipes found containing '{query}'")
     
+    def _complete(self, text: str, state: int) -> Optional[str]:
+        """Readline completer for folder and recipe names in the current folder."""
+        import readline
+        
+        if state == 0:
+            line = readline.get_line_buffer()[:readline.get_endidx()]
+            _, space, arg = line.partition(" ")
+            if not space:
+                # Still typing the command itself
+                self._completions = []
+            else:
+                # Names may contain spaces while readline only replaces the
+                # last word, so complete against the whole argument and return
+                # just the part that replaces the word being typed
+                current = self.current_node
+                arg = arg.lstrip()
+                offset = len(arg) - len(text)
+                self._completions = [
+                    name[offset:]
+                    for name in sorted([*current["folders"], *current["recipes"]])
+                    if name.lower().startswith(arg.lower())
+                ]
+        return self._completions[state] if state < len(self._completions) else None
+    
+    def _cmd_save(self) -> None:
+        """Handle the 'save' command."""
+        if self._recipes_dirty or self._prices_dirty:
+            self._flush_all(sync=True)
+            # Wait for the write so its outcome is reported before the next
+            # prompt, and a failed write shows up as unsaved changes again
+            self._writer_idle.wait()
+            self._print_write_reports()
+        else:
+            print("No unsaved changes.")
+    
+    def _cmd_cd(self, arg: str) -> None:
+        """Handle the 'cd' command."""
+        if arg == "..":
+            self.go_up()
+        else:
+            self.enter_folder(arg)
+    
+    def _cmd_move(self, arg: str) -> None:
+        """Handle the 'move' command."""
+        parts = arg.split(maxsplit=1)
+        if len(parts) == 2:
+            recipe_name, dest_path = parts
+            self.move_recipe(recipe_name, dest_path)
+        else:
+            print("Usage: move <recipe> <destination_path>")
+    
+    def _cmd_price(self, arg: str) -> None:
+        """Handle the 'price' command."""
+        parts = arg.split()
+        if len(parts) >= 3:
+            ingredient_name = " ".join(parts[:-2])
+            try:
+                price = float(parts[-2])
+                unit = parts[-1]
+                self.add_ingredient_price(ingredient_name, price, unit)
+            except ValueError:
+                print("Invalid price format. Usage: price <ingredient> <price> <unit>")
+        else:
+            print("Usage: price <ingredient> <price> <unit>")
+            print("Example: price Onion 1 oz")
+    
     def print_help(self) -> None:
         """Print available commands."""
         print("\nAvailable commands:")
@@ -646,6 +1021,7 @@ class RecipeManager:
         print("  move <recipe> <path>    Move a recipe to another folder")
         print("  search <query>          Search for recipes")
         print("  price <ingredient> <price> <unit>  Add/update ingredient price")
+        print("  save                    Save recipe changes to disk")
         print("  help                    Display this help message")
         print("  exit                    Exit the application")
     
@@ -656,7 +1032,20 @@ class RecipeManager:
         print("=" * 50)
         print("Type 'help' for available commands.")
         
+        try:
+            # Imported here rather than at module level since only the
+            # interactive loop needs it. It gives input() line editing,
+            # history and tab completion.
+            import readline
+        except ImportError:  # not available on Windows
+            pass
+        else:
+            readline.set_completer(self._complete)
+            readline.parse_and_bind("tab: complete")
+        
         while True:
+            # Report autosaves finished in the background before prompting
+            self._print_write_reports()
             self.display_current_path()
             command = input("> ").strip()
             
@@ -668,76 +1057,22 @@ class RecipeManager:
             arg = parts[1] if len(parts) > 1 else ""
             
             if cmd == "exit":
+                self._shutdown()
                 print("Goodbye!")
                 break
-            elif cmd == "help":
-                self.print_help()
-            elif cmd == "ls":
-                self.list_content()
-            elif cmd == "cd":
-                if arg == "..":
-                    self.go_up()
-                elif arg:
-                    self.enter_folder(arg)
-                else:
-                    print("Usage: cd <folder> or cd ..")
-            elif cmd == "mkdir":
-                if arg:
-                    self.create_folder(arg)
-                else:
-                    print("Usage: mkdir <folder>")
-            elif cmd == "rmdir":
-                if arg:
-                    self.delete_folder(arg)
-                else:
-                    print("Usage: rmdir <folder>")
-            elif cmd == "view":
-                if arg:
-                    self.view_recipe(arg)
-                else:
-                    print("Usage: view <recipe>")
-            elif cmd == "create":
-                if arg:
-                    self.create_recipe(arg)
-                else:
-                    print("Usage: create <recipe>")
-            elif cmd == "edit":
-                if arg:
-                    self.edit_recipe(arg)
-                else:
-                    print("Usage: edit <recipe>")
-            elif cmd == "delete":
-                if arg:
-                    self.delete_recipe(arg)
-                else:
-                    print("Usage: delete <recipe>")
-            elif cmd == "move":
-                parts = arg.split(maxsplit=1)
-                if len(parts) == 2:
-                    recipe_name, dest_path = parts
-                    self.move_recipe(recipe_name, dest_path)
-                else:
-                    print("Usage: move <recipe> <destination_path>")
-            elif cmd == "search":
-                if arg:
-                    self.search_recipes(arg)
-                else:
-                    print("Usage: search <query>")
-            elif cmd == "price":
-                parts = arg.split()
-                if len(parts) >= 3:
-                    ingredient_name = " ".join(parts[:-2])
-                    try:
-                        price = float(parts[-2])
-                        unit = parts[-1]
-                        self.add_ingredient_price(ingredient_name, price, unit)
-                    except ValueError:
-                        print("Invalid price format. Usage: price <ingredient> <price> <unit>")
-                else:
-                    print("Usage: price <ingredient> <price> <unit>")
-                    print("Example: price Onion 1 oz")
-            else:
+            
+            entry = self._commands.get(cmd)
+            if entry is None:
                 print(f"Unknown command: {cmd}. Type 'help' for available commands.")
+                continue
+            
+            handler, usage = entry
+            if usage is None:
+                handler()
+            elif arg:
+                handler(arg)
+            else:
+                print(f"Usage: {usage}")
 
 if __name__ == "__main__":
     manager = RecipeManager()
@@ -1,7 +1,27 @@
 import json
 import os
-from functools import lru_cache
-from typing import Union, Dict, Any, List, Optional
+import sys
+from collections import deque
+from typing import Union, Dict, Any, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
+
+
+class _ConversionTables(NamedTuple):
+    """Tables loaded and built from one conversion file."""
+    # Conversion factors as listed in the file
+    factors: Dict[str, Any]
+    # Factor for every convertible pair, as from_unit -> to_unit -> factor
+    closure: Dict[str, Dict[str, float]]
+    # Units listing a direct conversion to each unit
+    reverse_adj: Dict[str, Set[str]]
+    # Result of get_available_units
+    units: Tuple[str, ...]
+    # Results of get_compatible_units, filled in as units are asked for
+    compatible: Dict[str, Tuple[str, ...]]
 
 class UnitConverter:
     """
@@ -9,36 +29,120 @@ class UnitConverter:
     All methods can be called directly without instantiation.
     """
     
-    _conversion_factors = None
-    _default_conversion_file = os.path.join(os.path.dirname(__file__), 'conversions.json')
+    # Loaded tables per absolute conversion file path
+    _cache: Dict[str, _ConversionTables] = {}
+    # Closure for the default file, kept separately so convert() can skip the
+    # cache lookup in the common case
+    _default_closure: Optional[Dict[str, Dict[str, float]]] = None
+    _default_conversion_file = os.path.abspath(os.path.join(os.path.dirname(__file__), 'conversions.json'))
     
     @classmethod
-    @lru_cache(maxsize=1)
-    def _get_conversion_factors(cls, file_path: Optional[str] = None) -> Dict[str, Any]:
+    def _get_tables(cls, file_path: Optional[str] = None) -> _ConversionTables:
         """
-        Load and cache conversion factors from a JSON file.
+        Load and cache conversion factors from a JSON file, along with the tables built from them.
         
         Args:
             file_path (str, optional): Path to the JSON file containing conversion factors.
                 If None, will use the default conversions.json file.
         
         Returns:
-            dict: Dictionary of conversion factors.
+            _ConversionTables: The conversion factors and the tables built from them.
         """
-        if cls._conversion_factors is not None:
-            return cls._conversion_factors
-            
         if file_path is None:
             file_path = cls._default_conversion_file
-            
+        
+        # Key on the absolute path so relative and absolute spellings of the
+        # same file share one entry
+        cache_key = os.path.abspath(file_path)
+        tables = cls._cache.get(cache_key)
+        if tables is None:
+            tables = cls._cache[cache_key] = cls._load_tables(file_path)
+        return tables
+    
+    @classmethod
+    def _load_tables(cls, file_path: str) -> _ConversionTables:
+        """
+        Load conversion factors from a JSON file and build the tables used for conversions.
+        
+        Args:
+            file_path (str): Path to the JSON file containing conversion factors.
+        
+        Returns:
+            _ConversionTables: The conversion factors and the tables built from them.
+        
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the file is not valid JSON or holds a factor that isn't a non-zero number.
+        """
         try:
-            with open(file_path, 'r') as f:
-                cls._conversion_factors = json.load(f)
-                return cls._conversion_factors
+            # Read raw bytes and let the parser decode them
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            raw_factors = orjson.loads(data) if orjson is not None else json.loads(data)
         except FileNotFoundError:
             raise FileNotFoundError(f"Conversion file not found: {file_path}")
-        except json.JSONDecodeError:
+        except ValueError:  # json and orjson decode errors both subclass ValueError
             raise ValueError(f"Invalid JSON in conversion file: {file_path}")
+        
+        # Inverse factors are computed for every pair when building the
+        # closure, so reject anything that can't be divided by up front
+        if not isinstance(raw_factors, dict) or not all(isinstance(c, dict) for c in raw_factors.values()):
+            raise ValueError(f"Conversion file must map units to objects of factors: {file_path}")
+        for from_unit, conversions in raw_factors.items():
+            for to_unit, factor in conversions.items():
+                if isinstance(factor, bool) or not isinstance(factor, (int, float)) or factor == 0:
+                    raise ValueError(
+                        f"Invalid conversion factor {factor!r} from '{from_unit}' to '{to_unit}' in {file_path}"
+                    )
+        
+        # Intern unit names so lookups with interned units (as the recipe
+        # manager passes) compare keys by identity. The closure and reverse
+        # adjacency below are built from these same strings.
+        factors = {
+            sys.intern(from_unit): {sys.intern(to_unit): factor for to_unit, factor in conversions.items()}
+            for from_unit, conversions in raw_factors.items()
+        }
+        
+        reverse_adj: Dict[str, Set[str]] = {}
+        for from_unit, conversions in factors.items():
+            for to_unit in conversions:
+                reverse_adj.setdefault(to_unit, set()).add(from_unit)
+        
+        return _ConversionTables(factors, cls._build_closure(factors), reverse_adj, tuple(factors), {})
+    
+    @staticmethod
+    def _build_closure(factors: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+        """
+        Precompute the conversion factor between every pair of connected units.
+        
+        Args:
+            factors (dict): Conversion factors as loaded from the JSON file.
+        
+        Returns:
+            dict: Mapping of from_unit to a dict of to_unit -> factor to multiply by.
+        """
+        # Listed conversions take priority over the inverse of the reverse one
+        edges: Dict[str, Dict[str, float]] = {}
+        for from_unit, conversions in factors.items():
+            edges.setdefault(from_unit, {}).update(conversions)
+        for from_unit, conversions in factors.items():
+            for to_unit, factor in conversions.items():
+                edges.setdefault(to_unit, {}).setdefault(from_unit, 1 / factor)
+        
+        # Breadth-first search from each unit, multiplying factors along the way
+        closure = {}
+        for start_unit in edges:
+            reached = {start_unit: 1.0}
+            queue = deque([start_unit])
+            while queue:
+                unit = queue.popleft()
+                for next_unit, factor in edges[unit].items():
+                    if next_unit not in reached:
+                        reached[next_unit] = reached[unit] * factor
+                        queue.append(next_unit)
+            del reached[start_unit]
+            closure[start_unit] = reached
+        return closure
     
     @classmethod
     def set_conversion_file(cls, file_path: str) -> None:
@@ -48,12 +152,14 @@ class UnitConverter:
         Args:
             file_path (str): Path to the JSON file containing conversion factors.
         """
-        # Clear the cache and load the new file
-        cls._get_conversion_factors.cache_clear()
-        cls._conversion_factors = None
-        # Force load to validate the file
-        cls._get_conversion_factors(file_path)
-        # Update default path
+        # Load the new file first, so an invalid file leaves the current
+        # tables and default path untouched
+        tables = cls._load_tables(file_path)
+        # Then drop everything cached from other files and switch over
+        file_path = os.path.abspath(file_path)
+        cls._cache.clear()
+        cls._cache[file_path] = tables
+        cls._default_closure = tables.closure
         cls._default_conversion_file = file_path
     
     @classmethod
@@ -74,86 +180,97 @@ class UnitConverter:
         Raises:
             ValueError: If the conversion is not possible.
         """
-        # Get conversion factors (cached if using default file)
-        factors = cls._get_conversion_factors(conversion_file)
+        # Get the factor for every unit pair (cached per conversion file)
+        closure = cls._default_closure
+        if conversion_file is not None:
+            closure = cls._get_tables(conversion_file).closure
+        elif closure is None:
+            closure = cls._default_closure = cls._get_tables().closure
         
         # If units are the same, no conversion needed
         if from_unit == to_unit:
             return float(value)
         
-        # Direct conversion
-        if from_unit in factors and to_unit in factors[from_unit]:
-            return value * factors[from_unit][to_unit]
-        
-        # Check if reverse conversion exists
-        if to_unit in factors and from_unit in factors[to_unit]:
-            return value / factors[to_unit][from_unit]
-        
-        # Try to find a path between units using a recursive approach
-        def find_conversion_path(current_unit, target_unit, visited=None):
-            if visited is None:
-                visited = set()
+        # Direct, reverse and multi-step conversions were all worked out at load time
+        try:
+            return value * closure[from_unit][to_unit]
+        except KeyError:
+            pass
             
-            visited.add(current_unit)
+        raise ValueError(f"No conversion path found from '{from_unit}' to '{to_unit}'")
+    
+    @classmethod
+    def convert_many(cls, values: Sequence[Union[int, float]], from_units: Sequence[str],
+                     to_units: Sequence[str], conversion_file: Optional[str] = None) -> List[float]:
+        """
+        Convert several values at once, e.g. every ingredient of a recipe.
+        
+        Args:
+            values (sequence of float or int): The values to convert.
+            from_units (sequence of str): The unit to convert each value from.
+            to_units (sequence of str): The unit to convert each value to.
+            conversion_file (str, optional): Path to a custom conversion file to use just for these conversions.
             
-            # Check direct conversion
-            if current_unit in factors and target_unit in factors[current_unit]:
-                return [(current_unit, target_unit, factors[current_unit][target_unit])]
-                
-            # Try all possible intermediate units
-            for intermediate_unit in factors.get(current_unit, {}):
-                if intermediate_unit not in visited:
-                    path = find_conversion_path(intermediate_unit, target_unit, visited)
-                    if path:
-                        return [(current_unit, intermediate_unit, factors[current_unit][intermediate_unit])] + path
-                        
-            return None
-        
-        path = find_conversion_path(from_unit, to_unit)
-        if path:
-            result = value
-            for start_unit, end_unit, factor in path:
-                result *= factor
-            return result
+        Returns:
+            list: The converted values, in the same order as the input.
             
-        raise ValueError(f"No conversion path found from '{from_unit}' to '{to_unit}'")
+        Raises:
+            ValueError: If the sequences differ in length or any conversion is not possible.
+        """
+        if not len(values) == len(from_units) == len(to_units):
+            raise ValueError("values, from_units and to_units must have the same length")
+        
+        # Look the table up once for the whole batch
+        closure = cls._get_tables(conversion_file).closure
+        
+        results = []
+        for value, from_unit, to_unit in zip(values, from_units, to_units):
+            if from_unit == to_unit:
+                results.append(float(value))
+                continue
+            try:
+                results.append(value * closure[from_unit][to_unit])
+            except KeyError:
+                raise ValueError(f"No conversion path found from '{from_unit}' to '{to_unit}'") from None
+        return results
     
     @classmethod
-    def get_available_units(cls, conversion_file: Optional[str] = None) -> List[str]:
+    def get_available_units(cls, conversion_file: Optional[str] = None) -> Tuple[str, ...]:
         """
-        Get a list of all available units.
+        Get all available units.
         
         Args:
             conversion_file (str, optional): Path to a custom conversion file.
             
         Returns:
-            list: List of unit names.
+            tuple: Unit names, shared between calls.
         """
-        factors = cls._get_conversion_factors(conversion_file)
-        return list(factors.keys())
+        return cls._get_tables(conversion_file).units
     
     @classmethod
-    def get_compatible_units(cls, unit: str, conversion_file: Optional[str] = None) -> List[str]:
+    def get_compatible_units(cls, unit: str, conversion_file: Optional[str] = None) -> Tuple[str, ...]:
         """
-        Get a list of units that can be directly converted to/from the given unit.
+        Get the units that can be directly converted to/from the given unit.
         
         Args:
             unit (str): The unit to find compatible units for.
             conversion_file (str, optional): Path to a custom conversion file.
             
         Returns:
-            list: List of compatible unit names.
+            tuple: Compatible unit names, shared between calls.
         """
-        factors = cls._get_conversion_factors(conversion_file)
-        compatible = set()
+        tables = cls._get_tables(conversion_file)
+        result = tables.compatible.get(unit)
+        if result is not None:
+            return result
         
-        # Units we can convert to
-        if unit in factors:
-            compatible.update(factors[unit].keys())
+        # Don't cache unknown units, e.g. every prefix typed into a search box
+        if unit not in tables.factors and unit not in tables.reverse_adj:
+            return ()
         
-        # Units that can convert to this unit
-        for other_unit, conversions in factors.items():
-            if unit in conversions:
-                compatible.add(other_unit)
+        # Units we can convert to, plus units that can convert to this unit
+        compatible = set(tables.factors.get(unit, ()))
+        compatible.update(tables.reverse_adj.get(unit, ()))
         
-        return list(compatible)
\ No newline at end of file
+        result = tables.compatible[unit] = tuple(compatible)
+        return result
\ No newline at end of file